@@ -4,15 +4,21 @@ FaviconX - A command line tool for generating favicons from source images.
 Generates all standard favicon sizes and creates an index.html with proper meta tags.
 """
 
+import base64
+import json
 import os
+import shutil
+import struct
+import subprocess
 import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple
 import click
-from PIL import Image, ImageOps
+import PIL
+from PIL import Image
 import cairosvg
 import io
-import textwrap
 
 
 class FaviconGenerator:
@@ -42,7 +48,20 @@ class FaviconGenerator:
         (1024, 1024),
     ]
     
-    def __init__(self, source_path: str, output_path: str, icon_options=None, prefix="icon"):
+    # Sizes bundled into the ICO file
+    ICO_SIZES = [(16, 16), (32, 32), (48, 48)]
+    
+    # Size embedded in the SVG favicon for raster sources, large enough for HiDPI tabs
+    SVG_EMBED_SIZE = (192, 192)
+    
+    # Pillow PNG save options for each --png-optimize level
+    PNG_SAVE_OPTIONS = {
+        "none": {"optimize": False, "compress_level": 6},
+        "fast": {"optimize": True},
+        "best": {"optimize": False, "compress_level": 6},
+    }
+    
+    def __init__(self, source_path: str, output_path: str, icon_options=None, prefix="icon", png_optimize="none", fast=False):
         """Initialize the favicon generator.
         
         Args:
@@ -50,6 +69,8 @@ class FaviconGenerator:
             output_path: Directory to save generated favicons
             icon_options: Set of icon options to generate
             prefix: Prefix for all generated favicon files
+            png_optimize: PNG optimization level: none, fast or best
+            fast: Use BOX instead of LANCZOS resampling for sizes up to 48x48
         """
         self.source_path = Path(source_path)
         self.output_path = Path(output_path)
@@ -58,7 +79,24 @@ class FaviconGenerator:
             icon_options = {"Required", "Recommended", "Optional", "Legacy"}
         self.icon_options = set(icon_options)
         self.generated_icons = []  # List of dicts from ICON_SIZES that were generated
+        self._generated_by_filename = {}
         self.prefix = prefix
+        # Replace 'favicon' with prefix in filenames
+        self._filenames = {
+            icon["filename"]: icon["filename"].replace("favicon", prefix, 1) if icon["filename"].startswith("favicon") else icon["filename"]
+            for icon in ICON_SIZES
+        }
+        self._paths = {filename: self.output_path / filename for filename in self._filenames.values()}
+        if png_optimize not in self.PNG_SAVE_OPTIONS:
+            raise ValueError(f"Unknown PNG optimization level: {png_optimize}")
+        self.png_optimize = png_optimize
+        self._oxipng = shutil.which("oxipng") if png_optimize == "best" else None
+        self._png_save_options = self.PNG_SAVE_OPTIONS[png_optimize]
+        if png_optimize == "best" and self._oxipng is None:
+            # Without the oxipng pass, 'best' falls back to Pillow's optimize search
+            self._png_save_options = self.PNG_SAVE_OPTIONS["fast"]
+        self.fast = fast
+        self._svg_source = None
         
     def should_generate(self, icon):
         if "all" in self.icon_options:
@@ -66,10 +104,29 @@ class FaviconGenerator:
         return icon["option"] in self.icon_options
     
     def get_filename(self, icon):
-        # Replace 'favicon' with prefix in filename
-        if icon["filename"].startswith("favicon"):
-            return icon["filename"].replace("favicon", self.prefix, 1)
-        return icon["filename"]
+        return self._filenames[icon["filename"]]
+    
+    def get_output_file(self, filename: str) -> Path:
+        if filename in self._paths:
+            return self._paths[filename]
+        return self.output_path / filename
+    
+    def get_target_sizes(self) -> List[Tuple[int, int]]:
+        """Return the raster sizes needed by the selected icons."""
+        sizes = []
+        for icon in ICON_SIZES:
+            parsed = _ICON_ATTRS[icon["filename"]]["parsed"]
+            if not self.should_generate(icon) or parsed is None:
+                continue
+            kind = parsed[0]
+            if kind == "ICO":
+                sizes.extend(self.ICO_SIZES)
+            elif kind == "SVG":
+                if self.source_path.suffix.lower() != '.svg':
+                    sizes.append(self.SVG_EMBED_SIZE)
+            else:
+                sizes.append(parsed[1:])
+        return sizes
     
     def load_source_image(self) -> Image.Image:
         """Load and prepare the source image.
@@ -83,20 +140,8 @@ class FaviconGenerator:
         # Handle SVG files by converting to PNG first
         if self.source_path.suffix.lower() == '.svg':
             try:
-                import cairosvg
-                import io
-                
-                # Convert SVG to PNG bytes
-                png_data = cairosvg.svg2png(url=str(self.source_path))
-                
-                # Create PIL Image from PNG bytes
-                image = Image.open(io.BytesIO(png_data))
-                
-                # Convert to RGBA if not already
-                if image.mode != 'RGBA':
-                    image = image.convert('RGBA')
-                    
-                return image
+                # Render at the SVG's intrinsic size
+                return self.render_svg()
                 
             except ImportError:
                 raise ImportError("CairoSVG is required to process SVG files. Install with: pip install cairosvg")
@@ -106,6 +151,12 @@ class FaviconGenerator:
             # Load regular image formats
             image = Image.open(self.source_path)
             
+            # Let libjpeg downscale large JPEGs while decoding
+            if image.format == 'JPEG':
+                max_dim = max((max(size) for size in self.get_target_sizes()), default=0)
+                if max_dim and min(image.size) > 2 * max_dim:
+                    image.draft('RGB', (max_dim * 2, max_dim * 2))
+            
             # Convert to RGBA if not already
             if image.mode != 'RGBA':
                 image = image.convert('RGBA')
@@ -122,86 +173,225 @@ class FaviconGenerator:
         Returns:
             Resized image
         """
+        # BOX averaging is indistinguishable from LANCZOS at tiny sizes and much cheaper
+        if self.fast and max(size) <= 48:
+            return image.resize(size, Image.Resampling.BOX)
         # Use LANCZOS for high quality resizing
         resized = image.resize(size, Image.Resampling.LANCZOS)
         return resized
     
-    def generate_png_favicon(self, image: Image.Image, size: Tuple[int, int], filename: str):
-        """Generate a PNG favicon of specified size.
+    def build_resize_pyramid(self, image: Image.Image, sizes: Iterable[Tuple[int, int]]) -> Dict[Tuple[int, int], Image.Image]:
+        """Resize the source image to every target size, largest first.
+        
+        Each size is resampled from the smallest already resized image that is
+        at least twice as large, falling back to the source image, so the
+        small icons don't pay for a full-resolution LANCZOS pass. Resizing is
+        done on premultiplied alpha (RGBa), which Pillow would otherwise
+        convert to and from on every resize call.
         
         Args:
             image: Source image
+            sizes: Target sizes (width, height)
+            
+        Returns:
+            Dict mapping each target size to its resized image
+        """
+        mode = image.mode
+        if mode == 'RGBA':
+            image = image.convert('RGBa')
+        pyramid = {}
+        for size in sorted(set(sizes), reverse=True):
+            source = image
+            for cached_size in sorted(pyramid):
+                if (cached_size[0] >= 2 * size[0] and cached_size[1] >= 2 * size[1]
+                        and cached_size[0] < image.width and cached_size[1] < image.height):
+                    source = pyramid[cached_size]
+                    break
+            pyramid[size] = self.resize_image(source, size)
+        return {size: resized.convert(mode) for size, resized in pyramid.items()}
+    
+    def load_svg_source(self) -> bytes:
+        """Read the SVG source once and cache it for every render.
+        
+        CairoSVG rewrites some nodes of a parsed tree while drawing it, so each
+        render parses its own tree from these bytes.
+        
+        Returns:
+            SVG file contents
+        """
+        if self._svg_source is None:
+            if not self.source_path.exists():
+                raise FileNotFoundError(f"Source image not found: {self.source_path}")
+            self._svg_source = self.source_path.read_bytes()
+        return self._svg_source
+    
+    def render_svg(self, size: Optional[Tuple[int, int]] = None) -> Image.Image:
+        """Rasterize the SVG source directly at the specified size.
+        
+        Args:
+            size: Target size (width, height), or None for the SVG's own size
+            
+        Returns:
+            Rendered RGBA image
+        """
+        width, height = size if size is not None else (None, None)
+        # The url is kept so relative references resolve against the source file
+        png_data = cairosvg.svg2png(bytestring=self.load_svg_source(), url=str(self.source_path),
+                                    output_width=width, output_height=height)
+        image = Image.open(io.BytesIO(png_data))
+        if image.mode != 'RGBA':
+            image = image.convert('RGBA')
+        return image
+    
+    def generate_png_favicon(self, resized_map: Dict[Tuple[int, int], Image.Image], encoded_map: Dict[Tuple[int, int], bytes], size: Tuple[int, int], filename: str):
+        """Generate a PNG favicon of specified size.
+        
+        Sizes that were already encoded for sharing are written as is, the
+        rest are encoded straight into the output file.
+        
+        Args:
+            resized_map: Resized images keyed by size
+            encoded_map: PNG-encoded resized images keyed by size, for shared sizes
             size: Target size
             filename: Output filename
         """
-        resized = self.resize_image(image, size)
-        output_file = self.output_path / filename
-        resized.save(output_file, 'PNG', optimize=True)
+        output_file = self.get_output_file(filename)
+        if size in encoded_map:
+            output_file.write_bytes(encoded_map[size])
+        else:
+            with open(output_file, 'wb') as fh:
+                resized_map[size].save(fh, 'PNG', **self._png_save_options)
         return output_file
     
-    def generate_ico_favicon(self, image: Image.Image, filename: str):
+    def optimize_png_files(self, files: List[Path]):
+        """Recompress PNG files in place with oxipng, if it is installed.
+        
+        Args:
+            files: PNG files to optimize
+        """
+        if self._oxipng is None:
+            click.secho("oxipng not found, PNGs were saved with Pillow's optimize instead", fg="yellow")
+            return
+        if files:
+            # oxipng processes the files in parallel itself
+            subprocess.run([self._oxipng, "-o", "2", "--quiet", *[str(f) for f in files]], check=True)
+    
+    def encode_png(self, image: Image.Image) -> bytes:
+        """Encode an image as PNG with the configured optimization level.
+        
+        Args:
+            image: Image to encode
+            
+        Returns:
+            PNG file contents
+        """
+        buffer = io.BytesIO()
+        image.save(buffer, 'PNG', **self._png_save_options)
+        return buffer.getvalue()
+    
+    def generate_ico_favicon(self, encoded_map: Dict[Tuple[int, int], bytes], filename: str):
         """Generate ICO favicon with multiple sizes.
         
+        The ICO file is written directly, embedding the same PNG data as the
+        standalone favicons, so no frame is resized or encoded again.
+        
         Args:
-            image: Source image
+            encoded_map: PNG-encoded resized images keyed by size, including ICO_SIZES
             filename: Output filename
         """
         # ICO files typically contain multiple sizes
-        ico_sizes = [(16, 16), (32, 32), (48, 48)]
-        images = [self.resize_image(image, size) for size in ico_sizes]
+        frames = [(size, encoded_map[size]) for size in self.ICO_SIZES]
+        
+        # ICONDIR header followed by one ICONDIRENTRY per frame
+        header = struct.pack('<HHH', 0, 1, len(frames))
+        entries = []
+        offset = len(header) + 16 * len(frames)
+        for (width, height), data in frames:
+            # Width and height are stored in a byte, with 0 meaning 256
+            entries.append(struct.pack('<BBBBHHII', width % 256, height % 256, 0, 0, 1, 32, len(data), offset))
+            offset += len(data)
         
-        output_file = self.output_path / filename
-        images[0].save(
-            output_file,
-            format='ICO',
-            sizes=[(img.width, img.height) for img in images],
-            append_images=images[1:]
-        )
+        output_file = self.get_output_file(filename)
+        output_file.write_bytes(header + b''.join(entries) + b''.join(data for _, data in frames))
         return output_file
     
-    def generate_svg_favicon(self, image: Image.Image, filename: str):
+    def generate_svg_favicon(self, encoded_map: Dict[Tuple[int, int], bytes], filename: str):
         """Generate SVG favicon from the source image.
         
         Args:
-            image: Source image
+            encoded_map: PNG-encoded resized images keyed by size, including SVG_EMBED_SIZE for raster sources
             filename: Output filename
         """
-        # For SVG, we'll create a simple SVG that references the original image
-        # This is a basic approach - for more complex SVGs, you might want to vectorize the image
+        output_file = self.get_output_file(filename)
         
-        # Convert image to base64 for embedding
-        import base64
-        buffer = io.BytesIO()
-        image.save(buffer, format='PNG')
-        img_data = base64.b64encode(buffer.getvalue()).decode()
+        # SVG sources are already vector favicons
+        if self.source_path.suffix.lower() == '.svg':
+            shutil.copyfile(self.source_path, output_file)
+            return output_file
+        
+        # For raster sources, wrap the 192x192 icon in an SVG. Browsers don't load
+        # external resources from SVG favicons, so the PNG has to be embedded.
+        img_data = base64.b64encode(encoded_map[self.SVG_EMBED_SIZE]).decode()
+        width, height = self.SVG_EMBED_SIZE
         
-        svg_content = f'''<?xml version="1.0" encoding="UTF-8"?>\n<svg width="32" height="32" viewBox="0 0 32 32" xmlns="http://www.w3.org/2000/svg">\n  <image href="data:image/png;base64,{img_data}" width="32" height="32"/>\n</svg>'''
+        svg_content = f'''<?xml version="1.0" encoding="UTF-8"?>\n<svg width="{width}" height="{height}" viewBox="0 0 {width} {height}" xmlns="http://www.w3.org/2000/svg">\n  <image href="data:image/png;base64,{img_data}" width="{width}" height="{height}"/>\n</svg>'''
         
-        output_file = self.output_path / filename
         with open(output_file, 'w') as f:
             f.write(svg_content)
         return output_file
     
     def generate_all_favicons(self):
-        """Generate all favicon sizes and formats."""
-        try:
+        """Generate all favicon sizes and formats.
+        
+        Raises:
+            Exception: If the source image can't be loaded or a favicon can't be written
+        """
+        target_sizes = self.get_target_sizes()
+        if self.source_path.suffix.lower() == '.svg':
+            # Vector sources are rendered at each size instead of downscaled
+            resized_map = {size: self.render_svg(size) for size in set(target_sizes)}
+            click.secho(f"Loaded source image: {self.source_path}", fg="cyan", bold=True)
+        else:
             image = self.load_source_image()
             click.secho(f"Loaded source image: {self.source_path}", fg="cyan", bold=True)
-            for icon in ICON_SIZES:
-                if not self.should_generate(icon):
-                    continue
-                filename = self.get_filename(icon)
+            upscaled = sorted({size for size in target_sizes if size[0] > image.width or size[1] > image.height})
+            if upscaled:
+                click.secho(
+                    f"Warning: source image ({image.width}x{image.height}) is smaller than "
+                    f"{', '.join(f'{w}x{h}' for w, h in upscaled)}; these sizes will be upscaled",
+                    fg="yellow",
+                )
+            resized_map = self.build_resize_pyramid(image, target_sizes)
+        icons = [(icon, _ICON_ATTRS[icon["filename"]]["parsed"]) for icon in ICON_SIZES if self.should_generate(icon)]
+        # Encoding and writing each file is independent, and Pillow releases
+        # the GIL while encoding, so the files are written in parallel.
+        png_files = []
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+            # Sizes used by the ICO or SVG writers or by more than one file are
+            # encoded once up front and the bytes shared between writers
+            png_sizes = [parsed[1:] for _, parsed in icons if parsed is not None and parsed[0] == "PNG"]
+            shared_sizes = [size for size in resized_map if target_sizes.count(size) > 1 or size not in png_sizes]
+            encoded_map = dict(zip(shared_sizes, executor.map(self.encode_png, [resized_map[size] for size in shared_sizes])))
+            tasks = []
+            for icon, parsed in icons:
+                filename = self._filenames[icon["filename"]]
+                if parsed is None:
+                    future = None
+                elif parsed[0] == "ICO":
+                    future = executor.submit(self.generate_ico_favicon, encoded_map, filename)
+                elif parsed[0] == "SVG":
+                    future = executor.submit(self.generate_svg_favicon, encoded_map, filename)
+                else:
+                    future = executor.submit(self.generate_png_favicon, resized_map, encoded_map, parsed[1:], filename)
+                tasks.append((icon, parsed, filename, future))
+            for icon, parsed, filename, future in tasks:
                 generated = False
-                if icon["size"] == "ICO":
-                    self.generate_ico_favicon(image, filename)
-                    generated = True
-                elif icon["size"] == "SVG":
-                    self.generate_svg_favicon(image, filename)
+                if parsed is not None and parsed[0] in ("ICO", "SVG"):
+                    future.result()
                     generated = True
-                else:
+                elif future is not None:
                     try:
-                        w, h = [int(x) for x in icon["size"].replace('×', 'x').split('x')]
-                        self.generate_png_favicon(image, (w, h), filename)
+                        png_files.append(future.result())
                         generated = True
                     except Exception:
                         pass
@@ -209,10 +399,10 @@ class FaviconGenerator:
                 icon_copy["generated"] = generated
                 icon_copy["actual_filename"] = filename
                 self.generated_icons.append(icon_copy)
-            click.secho("\nFavicons generated!", fg="green", bold=True)
-        except Exception as e:
-            click.secho(f"Error generating favicons: {e}", fg="red", bold=True, err=True)
-            sys.exit(1)
+                self._generated_by_filename[filename] = icon_copy
+        if self.png_optimize == "best":
+            self.optimize_png_files(png_files)
+        click.secho("\nFavicons generated!", fg="green", bold=True)
 
     def print_summary_table(self):
         header = f"{'Size':<10} {'Filename':<24} {'Option':<12} {'Generated':<10} Usage"
@@ -220,8 +410,8 @@ class FaviconGenerator:
         click.secho(header, bold=True)
         click.secho("-" * len(header), fg="magenta")
         for icon in ICON_SIZES:
-            actual_filename = self.get_filename(icon)
-            generated = next((i["generated"] for i in self.generated_icons if i["actual_filename"] == actual_filename), False)
+            actual_filename = self._filenames[icon["filename"]]
+            generated = self._generated_by_filename.get(actual_filename, {}).get("generated", False)
             color = "green" if generated else "yellow"
             option_color = {
                 "Required": "green",
@@ -255,19 +445,12 @@ class HTMLGenerator:
         for icon in self.generated_icons:
             if not icon.get("generated"):
                 continue
-            size = icon["size"]
-            filename = icon["actual_filename"]
-            if size == "ICO":
-                meta_tags.append(f'<link rel="icon" type="image/x-icon" href="{filename}">')
-            elif size == "SVG":
-                meta_tags.append(f'<link rel="icon" type="image/svg+xml" href="{filename}">')
-            elif "apple" in filename or size in ["180×180", "167×167", "152×152", "120×120", "57×57", "72×72", "114×114", "144×144", "150×150"]:
-                meta_tags.append(f'<link rel="apple-touch-icon" sizes="{size}" href="{filename}">')
-            elif size in ["192×192", "512×512"]:
-                meta_tags.append(f'<link rel="icon" type="image/png" sizes="{size}" href="{filename}">')
-            elif filename.endswith(".png"):
-                # General PNG favicon
-                meta_tags.append(f'<link rel="icon" type="image/png" sizes="{size}" href="{filename}">')
+            attrs = _icon_attrs(icon)
+            if attrs["rel"] is None:
+                continue
+            type_attr = f' type="{attrs["type"]}"' if attrs["type"] else ''
+            sizes_attr = f' sizes="{icon["size"]}"' if icon["size"] not in ("ICO", "SVG") else ''
+            meta_tags.append(f'<link rel="{attrs["rel"]}"{type_attr}{sizes_attr} href="{icon["actual_filename"]}">')
         
         meta_tags_str = '\n    '.join(meta_tags)
         html_content = f'''<!DOCTYPE html>
@@ -287,24 +470,22 @@ class HTMLGenerator:
 </html>'''
         
         output_file = self.output_path / 'index.html'
-        with open(output_file, 'w') as f:
-            f.write(html_content)
+        output_file.write_text(html_content)
         
         click.echo(f"Generated: {output_file}")
     
     def generate_webmanifest(self):
         """Generate site.webmanifest file for PWA support."""
         # Only include icons that are generated and are 192x192 or 512x512
-        manifest_icons = []
-        for icon in self.generated_icons:
-            if not icon.get("generated"):
-                continue
-            if icon["size"] in ["192×192", "512×512"]:
-                manifest_icons.append({
-                    "src": icon["actual_filename"],
-                    "sizes": icon["size"],
-                    "type": "image/png"
-                })
+        manifest_icons = [
+            {
+                "src": icon["actual_filename"],
+                "sizes": icon["size"],
+                "type": "image/png"
+            }
+            for icon in self.generated_icons
+            if icon.get("generated") and _icon_attrs(icon)["pwa"]
+        ]
         manifest_content = {
             "name": "Your Website",
             "short_name": "Your App",
@@ -315,10 +496,8 @@ class HTMLGenerator:
             "theme_color": "#ffffff",
             "icons": manifest_icons
         }
-        import json
         output_file = self.output_path / 'site.webmanifest'
-        with open(output_file, 'w') as f:
-            json.dump(manifest_content, f, indent=2)
+        output_file.write_text(json.dumps(manifest_content, indent=2))
         
         click.echo(f"Generated: {output_file}")
 
@@ -350,37 +529,132 @@ ICON_SIZES = [
 ]
 
 
+def _parse_icon_size(size: str):
+    """Parse an ICON_SIZES size into ("ICO",), ("SVG",) or ("PNG", width, height).
+    
+    Returns None for sizes that can't be parsed.
+    """
+    if size in ("ICO", "SVG"):
+        return (size,)
+    try:
+        width, height = [int(x) for x in size.replace('×', 'x').split('x')]
+    except ValueError:
+        return None
+    return ("PNG", width, height)
+
+
+# Sizes linked as apple-touch-icon in index.html
+_APPLE_TOUCH_SIZES = {"180×180", "167×167", "152×152", "120×120", "57×57", "72×72", "114×114", "144×144", "150×150"}
+
+# Sizes listed in site.webmanifest
+_PWA_SIZES = {"192×192", "512×512"}
+
+
+def _html_link(icon):
+    """Return the rel and type attributes HTMLGenerator uses to link an icon.
+    
+    rel is None for icons that aren't linked from index.html.
+    """
+    if icon["size"] == "ICO":
+        return {"rel": "icon", "type": "image/x-icon"}
+    if icon["size"] == "SVG":
+        return {"rel": "icon", "type": "image/svg+xml"}
+    if "apple" in icon["filename"] or icon["size"] in _APPLE_TOUCH_SIZES:
+        return {"rel": "apple-touch-icon", "type": None}
+    if icon["filename"].endswith(".png"):
+        return {"rel": "icon", "type": "image/png"}
+    return {"rel": None, "type": None}
+
+
+def _compute_icon_attrs(icon):
+    """Return the parsed size, HTML link attributes and manifest flag of an icon."""
+    return {
+        **_html_link(icon),
+        "pwa": icon["size"] in _PWA_SIZES,
+        "parsed": _parse_icon_size(icon["size"]),
+    }
+
+
+# Attributes of every ICON_SIZES entry, computed once at import and keyed by filename
+_ICON_ATTRS = {icon["filename"]: _compute_icon_attrs(icon) for icon in ICON_SIZES}
+
+
+def _icon_attrs(icon):
+    """Return the precomputed attributes of an icon, computing them for unknown filenames."""
+    attrs = _ICON_ATTRS.get(icon["filename"])
+    return attrs if attrs is not None else _compute_icon_attrs(icon)
+
+
+# Map --option choices to icon option names
+OPTION_FILTERS = {
+    'required': {'Required'},
+    'recommended': {'Required', 'Recommended'},
+    'required-recommended': {'Required', 'Recommended'},
+    'optional': {'Required', 'Recommended', 'Optional'},
+    'all': {'Required', 'Recommended', 'Optional', 'Legacy'}
+}
+
+
+def generate_icons(source_image: str, output_directory: str, options=None, prefix="icon", png_optimize="none", fast=False, no_html=False) -> FaviconGenerator:
+    """Generate favicons, index.html and webmanifest for one source image.
+    
+    This is a module-level function so batch runs can call it in worker processes.
+    
+    Args:
+        source_image: Path to the source image
+        output_directory: Directory to save generated favicons
+        options: Set of icon options to generate
+        prefix: Prefix for all generated favicon files
+        png_optimize: PNG optimization level: none, fast or best
+        fast: Use BOX instead of LANCZOS resampling for sizes up to 48x48
+        no_html: Skip generating index.html and webmanifest files
+        
+    Returns:
+        The FaviconGenerator, with generated_icons filled in
+        
+    Raises:
+        FileNotFoundError: If the source image doesn't exist
+    """
+    if not Path(source_image).exists():
+        raise FileNotFoundError(f"Source image not found: {source_image}")
+    generator = FaviconGenerator(source_image, output_directory, icon_options=options, prefix=prefix, png_optimize=png_optimize, fast=fast)
+    generator.generate_all_favicons()
+    if not no_html:
+        html_generator = HTMLGenerator(output_directory, generator.generated_icons)
+        html_generator.generate_html()
+        html_generator.generate_webmanifest()
+    return generator
+
+
 @click.command()
-@click.argument('source_image', type=click.Path(exists=True, path_type=str))
+@click.argument('source_images', nargs=-1, required=True, type=click.Path(exists=True, path_type=str))
 @click.argument('output_directory', type=click.Path(path_type=str))
 @click.option('--no-html', is_flag=True, help='Skip generating index.html and webmanifest files')
 @click.option('--verbose', '-v', is_flag=True, help='Enable verbose output')
 @click.option('--icon-status', default='R,RC,O,L', show_default=True, help='Comma-separated list of icon statuses to generate: R,RC,O,L,ALL (default: R,RC,O,L)')
 @click.option('--prefix', default='icon', show_default=True, help='Prefix for all generated favicon files (default: icon)')
 @click.option('--option', type=click.Choice(['required', 'recommended', 'required-recommended', 'optional', 'all']), default='all', show_default=True, help='Filter icons by importance level (default: all)')
-def main(source_image: str, output_directory: str, no_html: bool, verbose: bool, icon_status: str, prefix: str, option: str):
+@click.option('--png-optimize', type=click.Choice(['none', 'fast', 'best']), default='none', show_default=True, help='PNG compression effort: none (zlib level 6), fast (Pillow optimize) or best (oxipng post-pass, falling back to fast) (default: none)')
+@click.option('--fast', is_flag=True, help='Use faster BOX resampling for icons up to 48x48')
+@click.option('--jobs', '-j', type=click.IntRange(min=1), default=1, show_default=True, help='Number of source images to process in parallel (default: 1)')
+def main(source_images: Tuple[str, ...], output_directory: str, no_html: bool, verbose: bool, icon_status: str, prefix: str, option: str, png_optimize: str, fast: bool, jobs: int):
     """
-    Generate favicons from a source image.
+    Generate favicons from one or more source images.
     
-    SOURCE_IMAGE: Path to the source image file (PNG, JPG, SVG, etc.)
-    OUTPUT_DIRECTORY: Directory where favicons will be saved
+    SOURCE_IMAGES: Path to the source image file(s) (PNG, JPG, SVG, etc.)
+    OUTPUT_DIRECTORY: Directory where favicons will be saved. With several
+    source images, each one gets a subdirectory named after the image.
 
     --icon-status: Comma-separated list of icon statuses to generate: R,RC,O,L,ALL (default: R,RC,O,L)
     --prefix: Prefix for all generated favicon files (default: icon)
     --option: Filter icons by importance level: required, recommended, required-recommended, optional, all (default: all)
+    --png-optimize: PNG compression effort: none, fast, best (default: none)
+    --fast: Use faster BOX resampling for icons up to 48x48
+    --jobs: Number of source images to process in parallel (default: 1)
     """
-    # Map option choices to option names
-    option_map = {
-        'required': {'Required'},
-        'recommended': {'Required', 'Recommended'},
-        'required-recommended': {'Required', 'Recommended'},
-        'optional': {'Required', 'Recommended', 'Optional'},
-        'all': {'Required', 'Recommended', 'Optional', 'Legacy'}
-    }
-    
     # Use option if specified, otherwise use icon_status
     if option != 'all':
-        options = option_map[option]
+        options = OPTION_FILTERS[option]
     else:
         # Convert old status codes to new option names
         status_to_option = {
@@ -391,28 +665,54 @@ def main(source_image: str, output_directory: str, no_html: bool, verbose: bool,
         }
         options = {status_to_option.get(s.strip().upper(), 'Required') for s in icon_status.split(",")}
     
+    if len(source_images) == 1:
+        outputs = [output_directory]
+    else:
+        stems = [Path(source).stem for source in source_images]
+        if len(set(stems)) != len(stems):
+            raise click.UsageError("Source images must have distinct file names")
+        outputs = [str(Path(output_directory) / stem) for stem in stems]
+    
     if verbose:
-        click.secho(f"Source image: {source_image}", fg="cyan")
+        for source_image in source_images:
+            click.secho(f"Source image: {source_image}", fg="cyan")
         click.secho(f"Output directory: {output_directory}", fg="cyan")
         click.secho(f"Icon options: {options}", fg="cyan")
         click.secho(f"Filename prefix: {prefix}", fg="cyan")
         click.secho(f"Option: {option}", fg="cyan")
-    try:
-        generator = FaviconGenerator(source_image, output_directory, icon_options=options, prefix=prefix)
-        generator.generate_all_favicons()
-        if not no_html:
-            html_generator = HTMLGenerator(output_directory, generator.generated_icons)
-            html_generator.generate_html()
-            html_generator.generate_webmanifest()
+        click.secho(f"PNG optimization: {png_optimize}", fg="cyan")
+        click.secho(f"Fast resampling: {fast}", fg="cyan")
+        click.secho(f"Parallel jobs: {jobs}", fg="cyan")
+        click.secho(f"Pillow version: {PIL.__version__}", fg="cyan")
+    kwargs = {"options": options, "prefix": prefix, "png_optimize": png_optimize, "fast": fast, "no_html": no_html}
+    # A failing source doesn't stop the others; failures are reported after the summaries
+    results = []
+    failures = []
+    if jobs > 1 and len(source_images) > 1:
+        # One process per source; each still writes its files with a thread pool
+        with ProcessPoolExecutor(max_workers=min(jobs, len(source_images))) as executor:
+            futures = [(source, output, executor.submit(generate_icons, source, output, **kwargs)) for source, output in zip(source_images, outputs)]
+            for source, output, future in futures:
+                try:
+                    results.append((future.result(), output))
+                except Exception as e:
+                    failures.append((source, e))
+    else:
+        for source, output in zip(source_images, outputs):
+            try:
+                results.append((generate_icons(source, output, **kwargs), output))
+            except Exception as e:
+                failures.append((source, e))
+    for generator, output in results:
         generator.print_summary_table()
         click.secho(f"\nFavicon generation complete!", fg="green", bold=True)
-        click.secho(f"Output directory: {output_directory}", fg="cyan")
+        click.secho(f"Output directory: {output}", fg="cyan")
         if not no_html:
-            click.secho(f"Open {output_directory}/index.html in your browser to test", fg="magenta")
-    except Exception as e:
-        click.secho(f"Error: {e}", fg="red", bold=True, err=True)
+            click.secho(f"Open {output}/index.html in your browser to test", fg="magenta")
+    for source, e in failures:
+        click.secho(f"Error generating favicons for {source}: {e}", fg="red", bold=True, err=True)
+    if failures:
         sys.exit(1)
 
-
 if __name__ == '__main__':
-    main() 
\ No newline at end of file
+    main()
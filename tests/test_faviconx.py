@@ -1,3 +1,6 @@
+import io
+import itertools
+import json
 import os
 import shutil
 import tempfile
@@ -6,83 +9,234 @@ from click.testing import CliRunner
 from PIL import Image
 import pytest
 
-from faviconx.__main__ import main, ICON_SIZES
+from faviconx.__main__ import main, generate_icons, FaviconGenerator, HTMLGenerator, ICON_SIZES, OPTION_FILTERS
 
-def create_sample_image(path, size=(256, 256), color=(255, 0, 0, 255)):
+def _name(icon, prefix):
+    """Return the generated filename of an icon for the given prefix."""
+    filename = icon['filename']
+    if filename.startswith('favicon'):
+        return prefix + filename[len('favicon'):]
+    return filename
+
+# Icon options each --option filter level is expected to generate
+FILTER_LEVELS = {
+    'required': ('Required',),
+    'required-recommended': ('Required', 'Recommended'),
+    'optional': ('Required', 'Recommended', 'Optional'),
+    'all': ('Required', 'Recommended', 'Optional', 'Legacy'),
+}
+
+# ICON_SIZES bucketed by option once at import
+_BY_OPTION = {o: tuple(i for i in ICON_SIZES if i['option'] == o) for o in FILTER_LEVELS['all']}
+
+def icons_for(filter_level):
+    """Return the icons generated for an --option filter level."""
+    return tuple(itertools.chain.from_iterable(_BY_OPTION[o] for o in FILTER_LEVELS[filter_level]))
+
+# Expected filenames (default 'icon' prefix) for each filter level
+REQUIRED_FILES = frozenset(_name(i, 'icon') for i in icons_for('required'))
+RC_FILES = frozenset(_name(i, 'icon') for i in icons_for('required-recommended'))
+O_FILES = frozenset(_name(i, 'icon') for i in icons_for('optional'))
+ALL_FILES = frozenset(_name(i, 'icon') for i in icons_for('all'))
+HTML_FILES = frozenset({'index.html', 'site.webmanifest'})
+
+def create_sample_image(path, size=(64, 64), color=(255, 0, 0, 255)):
     """Create a simple PNG image for testing."""
     img = Image.new('RGBA', size, color)
-    img.save(path)
+    buffer = io.BytesIO()
+    img.save(buffer, format='PNG', compress_level=0, optimize=False)
+    Path(path).write_bytes(buffer.getvalue())
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
 def sample_image(tmp_path_factory):
-    tmp_dir = tmp_path_factory.mktemp("data")
-    img_path = tmp_dir / "sample.png"
-    create_sample_image(img_path)
+    img_path = tmp_path_factory.getbasetemp() / "sample.png"
+    if not img_path.exists():
+        create_sample_image(img_path)
     return img_path
 
+@pytest.fixture(scope="module")
+def runner():
+    return CliRunner()
+
 @pytest.fixture
-def temp_output_dir(tmp_path):
-    return tmp_path / "output"
+def temp_output_dir():
+    # Prefer tmpfs so generated files never touch the disk
+    root = '/dev/shm' if os.path.isdir('/dev/shm') else None
+    tmp_dir = Path(tempfile.mkdtemp(dir=root))
+    yield tmp_dir / "output"
+    shutil.rmtree(tmp_dir)
 
-def test_cli_required(sample_image, temp_output_dir):
-    runner = CliRunner()
-    result = runner.invoke(main, [str(sample_image), str(temp_output_dir), '--option', 'required'])
+@pytest.fixture(scope="module")
+def all_icons_dir(sample_image, tmp_path_factory):
+    """Generate the full icon set once for tests that inspect its files."""
+    output_dir = tmp_path_factory.mktemp("all") / "output"
+    generate_icons(str(sample_image), str(output_dir), options=OPTION_FILTERS['all'])
+    return output_dir
+
+@pytest.mark.parametrize("flt,expected", [
+    ('required', REQUIRED_FILES),
+    ('required-recommended', RC_FILES),
+    ('optional', O_FILES),
+    ('all', ALL_FILES),
+])
+def test_cli_filter(runner, sample_image, temp_output_dir, flt, expected):
+    result = runner.invoke(main, [str(sample_image), str(temp_output_dir), '--option', flt])
     assert result.exit_code == 0
-    # Check that required icons are generated
-    for icon in ICON_SIZES:
-        if icon['option'] == 'Required':
-            filename = icon['filename'].replace('favicon', 'icon', 1)
-            assert (temp_output_dir / filename).exists()
+    # Check that exactly the icons for the filter level are generated
+    got = {e.name for e in os.scandir(temp_output_dir)}
+    assert got == expected | HTML_FILES
 
 def test_cli_prefix(sample_image, temp_output_dir):
-    runner = CliRunner()
     prefix = 'testico'
-    result = runner.invoke(main, [str(sample_image), str(temp_output_dir), '--prefix', prefix, '--option', 'required-recommended'])
-    assert result.exit_code == 0
+    generate_icons(str(sample_image), str(temp_output_dir), options=OPTION_FILTERS['required-recommended'], prefix=prefix)
     # Check that files use the prefix
-    for icon in ICON_SIZES:
-        if icon['option'] in {'Required', 'Recommended'}:
-            filename = icon['filename'].replace('favicon', prefix, 1)
-            assert (temp_output_dir / filename).exists()
-
-def test_cli_optional(sample_image, temp_output_dir):
-    runner = CliRunner()
-    result = runner.invoke(main, [str(sample_image), str(temp_output_dir), '--option', 'optional'])
-    assert result.exit_code == 0
-    # Check that optional icons are generated
-    for icon in ICON_SIZES:
-        if icon['option'] in {'Required', 'Recommended', 'Optional'}:
-            filename = icon['filename'].replace('favicon', 'icon', 1)
-            assert (temp_output_dir / filename).exists()
-
-def test_cli_all(sample_image, temp_output_dir):
-    runner = CliRunner()
-    result = runner.invoke(main, [str(sample_image), str(temp_output_dir), '--option', 'all'])
-    assert result.exit_code == 0
-    # Check that all icons are generated
-    for icon in ICON_SIZES:
-        filename = icon['filename'].replace('favicon', 'icon', 1)
-        assert (temp_output_dir / filename).exists()
+    expected = {_name(i, prefix) for i in icons_for('required-recommended')}
+    got = {e.name for e in os.scandir(temp_output_dir)}
+    assert got == expected | HTML_FILES
+
+def test_optional_filter_excludes_legacy():
+    # Legacy icons are only generated by 'all', so 'optional' is a strict subset
+    assert {i['option'] for i in ICON_SIZES} == {'Required', 'Recommended', 'Optional', 'Legacy'}
+    assert O_FILES < ALL_FILES
 
-def test_cli_error_on_missing_image(temp_output_dir):
-    runner = CliRunner()
+def test_cli_error_on_missing_image(runner, temp_output_dir):
+    with pytest.raises(FileNotFoundError):
+        generate_icons("notfound.png", str(temp_output_dir))
     result = runner.invoke(main, ["notfound.png", str(temp_output_dir)])
     assert result.exit_code != 0
     assert "does not exist" in result.output
+    # Check that the error path fails before creating the output directory
+    assert not temp_output_dir.exists()
 
-def test_cli_no_html_option(sample_image, temp_output_dir):
-    runner = CliRunner()
+def test_cli_no_html_option(runner, sample_image, temp_output_dir):
     result = runner.invoke(main, [str(sample_image), str(temp_output_dir), '--no-html'])
     assert result.exit_code == 0
     # Check that favicons are generated but HTML files are not
-    assert (temp_output_dir / "icon.ico").exists()
-    assert not (temp_output_dir / "index.html").exists()
-    assert not (temp_output_dir / "site.webmanifest").exists()
+    present = {e.name for e in os.scandir(temp_output_dir)}
+    assert "icon.ico" in present
+    assert "index.html" not in present
+    assert "site.webmanifest" not in present
+
+@pytest.mark.parametrize("level", ['none', 'fast', 'best'])
+def test_cli_png_optimize(runner, sample_image, temp_output_dir, level):
+    result = runner.invoke(main, [str(sample_image), str(temp_output_dir), '--option', 'required', '--png-optimize', level])
+    assert result.exit_code == 0
+    # Check that every compression level generates the same files
+    got = {e.name for e in os.scandir(temp_output_dir)}
+    assert got == REQUIRED_FILES | HTML_FILES
 
-def test_cli_verbose_output(sample_image, temp_output_dir):
-    runner = CliRunner()
+def test_cli_verbose_output(runner, sample_image, temp_output_dir):
     result = runner.invoke(main, [str(sample_image), str(temp_output_dir), '--verbose'])
     assert result.exit_code == 0
     # Check that verbose output is present
     assert "Source image:" in result.output
-    assert "Output directory:" in result.output 
\ No newline at end of file
+    assert "Output directory:" in result.output
+
+def test_cli_ico_contains_all_sizes(all_icons_dir):
+    # Check that the ICO file bundles every ICO size
+    with Image.open(all_icons_dir / "icon.ico") as ico:
+        assert ico.info["sizes"] == {(16, 16), (32, 32), (48, 48)}
+
+def test_cli_batch_jobs(runner, sample_image, tmp_path, temp_output_dir):
+    second_image = tmp_path / "second.png"
+    create_sample_image(second_image)
+    result = runner.invoke(main, [str(sample_image), str(second_image), str(temp_output_dir), '--option', 'required', '--jobs', '2'])
+    assert result.exit_code == 0
+    # Check that each source gets its own output directory
+    for stem in (sample_image.stem, second_image.stem):
+        present = {e.name for e in os.scandir(temp_output_dir / stem)}
+        assert "icon.ico" in present
+        assert "index.html" in present
+
+def test_cli_batch_reports_failed_source(runner, sample_image, tmp_path, temp_output_dir):
+    bad_image = tmp_path / "bad.png"
+    bad_image.write_bytes(b"not an image")
+    result = runner.invoke(main, [str(bad_image), str(sample_image), str(temp_output_dir), '--option', 'required', '--jobs', '2'])
+    # Check that the corrupt source fails the run without stopping the other source
+    assert result.exit_code == 1
+    assert f"Error generating favicons for {bad_image}" in result.output
+    assert result.output.count("Favicon generation complete!") == 1
+    present = {e.name for e in os.scandir(temp_output_dir / sample_image.stem)}
+    assert present == REQUIRED_FILES | HTML_FILES
+
+def test_cli_large_source_is_downscaled(runner, tmp_path, temp_output_dir):
+    large_image = tmp_path / "large.png"
+    image = Image.new('RGBA', (1024, 1024), (255, 0, 0, 255))
+    image.paste((0, 0, 255, 255), (512, 0, 1024, 1024))
+    image.save(large_image, compress_level=0)
+    result = runner.invoke(main, [str(large_image), str(temp_output_dir)])
+    assert result.exit_code == 0
+    assert "upscaled" not in result.output
+    # Check that every PNG is downscaled to its size and keeps the source's red and blue halves
+    for icon in icons_for('all'):
+        if icon['filename'].endswith('.png'):
+            with Image.open(temp_output_dir / _name(icon, 'icon')) as png:
+                width, height = (int(x) for x in icon['size'].split('×'))
+                assert png.size == (width, height)
+                assert png.getpixel((0, 0)) == (255, 0, 0, 255)
+                assert png.getpixel((width - 1, height - 1)) == (0, 0, 255, 255)
+
+def test_cli_small_source_is_upscaled(runner, tmp_path, temp_output_dir):
+    small_image = tmp_path / "small.png"
+    create_sample_image(small_image, size=(100, 100))
+    result = runner.invoke(main, [str(small_image), str(temp_output_dir), '--option', 'required'])
+    assert result.exit_code == 0
+    # Check that larger sizes are still generated, with a warning after the source is loaded
+    assert result.output.index("Loaded source image:") < result.output.index("upscaled")
+    with Image.open(temp_output_dir / "icon-512x512.png") as icon:
+        assert icon.size == (512, 512)
+
+def test_resize_pyramid_reuses_larger_levels(tmp_path, monkeypatch):
+    generator = FaviconGenerator(str(tmp_path / "unused.png"), str(tmp_path / "output"))
+    sources = {}
+    resize_image = generator.resize_image
+    def recording_resize(image, size):
+        sources[size] = image.size
+        return resize_image(image, size)
+    monkeypatch.setattr(generator, "resize_image", recording_resize)
+    resized = generator.build_resize_pyramid(Image.new('RGBA', (1024, 1024)), [(16, 16), (32, 32), (256, 256), (512, 512)])
+    assert {size: image.size for size, image in resized.items()} == {size: size for size in resized}
+    # Check that each size is resampled from the smallest level at least twice its size
+    assert sources == {(512, 512): (1024, 1024), (256, 256): (512, 512), (32, 32): (256, 256), (16, 16): (32, 32)}
+
+def test_cli_svg_source(runner, tmp_path, temp_output_dir):
+    svg_image = tmp_path / "logo.svg"
+    svg_image.write_text('<svg xmlns="http://www.w3.org/2000/svg" width="100" height="100"><rect width="100" height="100" fill="red"/></svg>')
+    result = runner.invoke(main, [str(svg_image), str(temp_output_dir), '--option', 'required'])
+    assert result.exit_code == 0
+    # Check that each PNG is rendered at its own size and the SVG is copied verbatim
+    for icon in icons_for('required'):
+        if icon['filename'].endswith('.png'):
+            with Image.open(temp_output_dir / _name(icon, 'icon')) as png:
+                assert png.size == tuple(int(x) for x in icon['size'].split('×'))
+    assert (temp_output_dir / "icon.svg").read_bytes() == svg_image.read_bytes()
+
+def test_html_generator_accepts_icon_sizes_entries(tmp_path):
+    icons = [{**icon, "generated": True, "actual_filename": icon["filename"]} for icon in ICON_SIZES]
+    html_generator = HTMLGenerator(str(tmp_path), icons)
+    html_generator.generate_html()
+    html_generator.generate_webmanifest()
+    # Check that plain ICON_SIZES entries are linked and listed in the manifest
+    html = (tmp_path / "index.html").read_text()
+    assert '<link rel="icon" type="image/x-icon" href="favicon.ico">' in html
+    assert '<link rel="apple-touch-icon" sizes="180×180" href="favicon-180x180.png">' in html
+    manifest = json.loads((tmp_path / "site.webmanifest").read_text())
+    assert [i["src"] for i in manifest["icons"]] == ["favicon-192x192.png", "favicon-512x512.png"]
+
+def test_load_source_image_drafts_large_jpeg(tmp_path):
+    jpeg_image = tmp_path / "large.jpg"
+    Image.new('RGB', (2048, 2048), (255, 0, 0)).save(jpeg_image, 'JPEG')
+    generator = FaviconGenerator(str(jpeg_image), str(tmp_path / "output"), icon_options=OPTION_FILTERS['required'])
+    image = generator.load_source_image()
+    # Check that the JPEG is decoded at reduced scale, but still covers the largest required size
+    assert image.mode == 'RGBA'
+    assert image.size == (1024, 1024)
+
+def test_cli_fast_option(runner, sample_image, temp_output_dir):
+    result = runner.invoke(main, [str(sample_image), str(temp_output_dir), '--option', 'required', '--fast'])
+    assert result.exit_code == 0
+    # Check that the BOX-resampled small icons are still generated at their size
+    with Image.open(temp_output_dir / "icon-16x16.png") as icon:
+        assert icon.size == (16, 16)
+    with Image.open(temp_output_dir / "icon.ico") as ico:
+        assert ico.info["sizes"] == {(16, 16), (32, 32), (48, 48)}